@@ -7,7 +7,11 @@ Diagnosis Data Analyzer MCP Server v7
 
 from fastmcp import FastMCP
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Tuple, Any
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import datetime
 import csv
 import re
 import os
@@ -16,6 +20,39 @@ import json
 mcp = FastMCP("CR Filesystem v7")
 
 WORK_DIR = os.environ.get('LAB_WORK_DIR')
+DEBUG = bool(os.environ.get('MCP_DEBUG'))
+
+# 정규식 (모듈 로드 시 1회 컴파일)
+_ANGLE_RE = re.compile(r'[<>]')
+_DATE8_RE = re.compile(r'^\d{8}$')
+_DATE_CLEAN_RE = re.compile(r'[-./년월일\s]')
+# 월/일이 한 자리인 경우 (예: "2023-3-8", "2023년 3월 8일")
+_DATE_YMD_RE = re.compile(r'^(\d{4})\s*[-/.년]\s*(\d{1,2})\s*[-/.월]\s*(\d{1,2})\s*일?$')
+_POSITIVE_RE = re.compile(r'positive|reactive|detected', re.IGNORECASE)
+_EXCLUDE_FILE_RE = re.compile(r'input|output|requirements|readme', re.IGNORECASE)
+LAB_COLUMNS = ('lab_name', 'lab_value', 'lab_unit')
+# lab_name 앞의 상태 표시: (괄호 표기, 단독 표기, 상태), 검사 우선순위 순
+_STATUS_MARKS = (
+    ('(▼)', '▼', 'decreased'),
+    ('(▲)', '▲', 'increased'),
+    ('(◆)', '◆', 'qualitative_abnormal'),  # 문자형 이상 (Positive 등)
+)
+
+# 문서 요약용 패턴은 bytes(UTF-8) 기준: 본문 전체를 디코딩하지 않고 스캔
+# R/O, suspect 등 7개 패턴을 하나의 alternation으로 합쳐 본문을 한 번만 스캔
+# lookahead로 감싸서 겹치는 결과도 모두 추출 - 같은 패턴끼리 겹치는 경우(예: "R/O A, R/O B"의 B)도
+# 포함되므로 패턴별로 따로 스캔하던 이전 방식보다 많은 결과를 보고함 (의도된 변경, 최대 10개 제한은 동일)
+_SUSPECT_COMBINED = re.compile(
+    rb'(?=(?:(?:R/O|rule out|suspect|possible)\s+'
+    rb'|(?:differential\s+diagnosis|impression|assessment)[:\s]+)'
+    rb'([A-Za-z\s,]+))',
+    re.IGNORECASE | re.MULTILINE
+)
+_CC_MARKERS = tuple(m.encode('utf-8') for m in ("Chief Complaint", "주소", "CC:", "C/C:"))
+_ASSESSMENT_MARKERS = tuple(m.encode('utf-8') for m in ("Assessment", "평가", "Impression"))
+_PLAN_MARKERS = tuple(m.encode('utf-8') for m in ("Plan", "계획", "치료"))
+_NEXT_SECTION_RE = re.compile(b'|'.join(re.escape(m.encode('utf-8')) for m in ("Plan", "계획", "\n\n【", "---")))
+_SECTION_RE = re.compile(b'|'.join(map(re.escape, _CC_MARKERS + _ASSESSMENT_MARKERS + _PLAN_MARKERS)))
 
 
 # ============================================
@@ -26,23 +63,72 @@ def parse_value(value_str) -> Optional[float]:
     """검사 결과값을 float으로 파싱"""
     if not value_str or value_str == '':
         return None
+    try:
+        # 대부분의 값은 순수 숫자이므로 정리 작업 없이 먼저 변환 시도
+        return float(value_str)
+    except (TypeError, ValueError):
+        pass
     try:
         if isinstance(value_str, str):
-            value_str = re.sub(r'[<>]', '', value_str).strip().replace(',', '')
+            value_str = _ANGLE_RE.sub('', value_str).strip().replace(',', '')
         return float(value_str)
     except:
         return None
 
 
+def read_text(path: Path) -> str:
+    """텍스트 파일 전체 읽기 (TextIOWrapper 없이 bytes로 읽은 뒤 한 번에 디코딩)"""
+    content = path.read_bytes().decode('utf-8')
+    # 텍스트 모드와 동일하게 줄바꿈 정규화 (CRLF가 있는 파일만)
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def lab_column_indices(header: List[str]):
+    """
+    lab.csv 헤더에서 LAB_COLUMNS 위치 반환
+    - 없는 컬럼은 행 끝에 덧붙이는 빈 칸(width 위치)을 가리킴
+    """
+    width = len(header)
+    return width, tuple(header.index(c) if c in header else width for c in LAB_COLUMNS)
+
+
+def split_status_mark(lab_name: str) -> Tuple[str, str]:
+    """
+    lab_name의 ▼▲◆ 표시로 상태 판별 후 (상태, 표시 제거한 이름) 반환
+    - 정규식 대신 startswith/slice로 앞쪽 표시만 제거
+    """
+    for paren_mark, mark, status in _STATUS_MARKS:
+        if lab_name.startswith(paren_mark):
+            return status, lab_name[len(paren_mark):].lstrip()
+        if lab_name.startswith(mark):
+            return status, lab_name[len(mark):].lstrip()
+        if paren_mark in lab_name:
+            # 중간에 표시가 있으면 상태만 반영, 이름은 그대로
+            return status, lab_name
+    return "normal", lab_name
+
+
+@functools.lru_cache(maxsize=256)
 def parse_date(date_str: str) -> str:
-    """날짜 문자열을 YYYYMMDD 형식으로 파싱"""
+    """날짜 문자열을 YYYYMMDD 형식으로 파싱 (순수 함수이므로 결과 캐시)"""
     if not date_str:
         return None
-    if re.match(r'^\d{8}$', date_str):
+    if _DATE8_RE.match(date_str):
         return date_str
-    cleaned = re.sub(r'[-./년월일\s]', '', date_str)
-    if re.match(r'^\d{8}$', cleaned):
+    cleaned = _DATE_CLEAN_RE.sub('', date_str)
+    if _DATE8_RE.match(cleaned):
         return cleaned
+    match = _DATE_YMD_RE.match(date_str.strip())
+    if match:
+        y, m, d = match.groups()
+        try:
+            datetime.date(int(y), int(m), int(d))  # 범위 검증 (예: 13월, 2월 30일)
+        except ValueError:
+            raise ValueError(f"날짜 형식을 인식할 수 없습니다: {date_str}") from None
+        return f"{y}{m:0>2}{d:0>2}"
+    # 그 외 형식만 dateutil로 처리 (느리고 선택적 의존성)
     try:
         from dateutil import parser
         dt = parser.parse(date_str)
@@ -52,40 +138,36 @@ def parse_date(date_str: str) -> str:
     raise ValueError(f"날짜 형식을 인식할 수 없습니다: {date_str}")
 
 
-def extract_suspect_diagnoses(content: str) -> List[str]:
+def extract_suspect_diagnoses(content: bytes) -> List[str]:
     """
     의심 진단 추출 (일반화)
     - R/O, suspect, rule out 등 구조적 패턴
     - 특정 질병명 하드코딩 없음
     """
-    suspect_patterns = [
-        r'R/O\s+([A-Za-z\s,]+)',
-        r'rule out\s+([A-Za-z\s,]+)',
-        r'suspect\s+([A-Za-z\s,]+)',
-        r'possible\s+([A-Za-z\s,]+)',
-        r'differential\s+diagnosis[:\s]+([A-Za-z\s,\n]+)',
-        r'impression[:\s]+([A-Za-z\s,\n]+)',
-        r'assessment[:\s]+([A-Za-z\s,\n]+)'
-    ]
-    
     findings = []
-    for pattern in suspect_patterns:
-        matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE)
-        for match in matches:
-            diagnosis = match.group(1).strip()
-            # 너무 길면 자르기 (최대 100자)
-            if len(diagnosis) > 100:
-                diagnosis = diagnosis[:100]
-            findings.append(diagnosis)
+    for match in _SUSPECT_COMBINED.finditer(content):
+        # 너무 길면 자르기 (최대 100자)
+        findings.append(match.group(1).strip()[:100].decode('ascii'))
+        if len(findings) == 10:  # 최대 10개
+            break
     
-    return findings[:10]  # 최대 10개
+    return findings
+
 
+def _decode_window(content: bytes, start: int, max_chars: int, end: Optional[int] = None) -> str:
+    """bytes 본문의 start 위치부터 최대 max_chars 글자만 디코딩 (UTF-8 한 글자 ≤ 4 bytes)"""
+    stop = start + 4 * max_chars
+    if end is not None and end < stop:
+        stop = end
+    return content[start:stop].decode('utf-8', errors='replace')[:max_chars].strip()
 
-def summarize_document_structure(content: str, filename: str) -> Dict[str, Any]:
+
+def summarize_document_structure(content: bytes, filename: str) -> Dict[str, Any]:
     """
     문서 구조적 요약 (일반화)
     - 특정 키워드 의존 없음
     - 섹션 구조만 활용
+    - content는 UTF-8 bytes, 추출한 짧은 구간만 디코딩
     """
     summary = {
         "filename": filename,
@@ -95,49 +177,115 @@ def summarize_document_structure(content: str, filename: str) -> Dict[str, Any]:
         "key_plan": ""
     }
     
+    # 섹션 마커 위치를 한 번의 스캔으로 수집 (마커별 첫 등장 위치의 끝)
+    section_ends = {}
+    for match in _SECTION_RE.finditer(content):
+        section_ends.setdefault(match.group(), match.end())
+    
     # Chief Complaint (처음 200자)
-    for marker in ["Chief Complaint", "주소", "CC:", "C/C:"]:
-        idx = content.find(marker)
-        if idx != -1:
-            start = idx + len(marker)
-            end = min(start + 200, len(content))
-            summary["chief_complaint"] = content[start:end].strip()
+    for marker in _CC_MARKERS:
+        if marker in section_ends:
+            summary["chief_complaint"] = _decode_window(content, section_ends[marker], 200)
             break
     
     # Assessment (R/O 포함 부분만, 최대 400자)
-    for marker in ["Assessment", "평가", "Impression"]:
-        idx = content.find(marker)
-        if idx != -1:
-            start = idx + len(marker)
-            # 다음 섹션까지
-            next_section_idx = -1
-            for next_marker in ["Plan", "계획", "\n\n【", "---"]:
-                temp_idx = content.find(next_marker, start)
-                if temp_idx != -1:
-                    if next_section_idx == -1 or temp_idx < next_section_idx:
-                        next_section_idx = temp_idx
-            
-            if next_section_idx != -1:
-                end = min(start + 400, next_section_idx)
-            else:
-                end = start + 400
-            
-            summary["key_assessment"] = content[start:end].strip()
+    for marker in _ASSESSMENT_MARKERS:
+        if marker in section_ends:
+            start = section_ends[marker]
+            # 다음 섹션까지 (가장 먼저 나오는 다음 섹션 마커를 한 번에 탐색)
+            next_section = _NEXT_SECTION_RE.search(content, start)
+            next_section_idx = next_section.start() if next_section else None
+            summary["key_assessment"] = _decode_window(content, start, 400, end=next_section_idx)
             break
     
     # Plan (처음 300자)
-    for marker in ["Plan", "계획", "치료"]:
-        idx = content.find(marker)
-        if idx != -1:
-            start = idx + len(marker)
-            end = min(start + 300, len(content))
-            summary["key_plan"] = content[start:end].strip()
+    for marker in _PLAN_MARKERS:
+        if marker in section_ends:
+            summary["key_plan"] = _decode_window(content, section_ends[marker], 300)
             break
     
     return summary
 
 
-def select_top_abnormal_labs(all_labs: List[Dict], top_n: int = 15) -> List[Dict]:
+@functools.lru_cache(maxsize=128)
+def _parse_lab_file(lab_file_path: str, mtime_ns: int) -> Tuple[Dict[str, Any], ...]:
+    """
+    lab.csv 파싱 (summary/full lab 조회 공용)
+    - (경로, mtime) 기준 캐시: 파일이 바뀌면 자동으로 다시 파싱
+    - 캐시된 결과를 공유하므로 tuple로 반환, 호출측에서 수정 금지
+    """
+    labs = []
+    with open(lab_file_path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        width, (i_name, i_value, i_unit) = lab_column_indices(next(reader, []))
+        for row in reader:
+            if not row:
+                continue
+            if len(row) <= width:
+                row += [''] * (width + 1 - len(row))
+            
+            lab_name_raw = row[i_name].strip()
+            status = "normal"
+            lab_name = lab_name_raw
+            
+            if lab_name_raw:
+                status, lab_name = split_status_mark(lab_name_raw)
+            
+            value_raw = row[i_value].strip()
+            value_numeric = parse_value(value_raw)
+            
+            # 문자형 결과 (Positive/Negative) 처리
+            # 화살표가 없고 숫자도 아닌 경우
+            if status == "normal" and value_numeric is None and value_raw:
+                # Positive 계열 → qualitative_abnormal
+                if _POSITIVE_RE.search(value_raw):
+                    status = "qualitative_abnormal"
+                # Negative 계열은 이미 normal (기본값)
+            
+            if lab_name and value_raw:
+                lab_entry = {
+                    "test_name": lab_name,
+                    "value_raw": value_raw,
+                    "unit": row[i_unit].strip(),
+                    "status": status
+                }
+                
+                if value_numeric is not None:
+                    lab_entry["value_numeric"] = value_numeric
+                
+                labs.append(lab_entry)
+    
+    return tuple(labs)
+
+
+def load_labs(lab_file: Path) -> Tuple[Dict[str, Any], ...]:
+    """lab.csv 데이터 조회 (파일 mtime 기준 캐시 사용)"""
+    return _parse_lab_file(str(lab_file), lab_file.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1024)
+def _summarize_document_file(txt_file_path: str, size: int, mtime_ns: int) -> Dict[str, Any]:
+    """
+    문서 파일 요약 (파일별 캐시)
+    - (경로, 크기, mtime) 기준: 수정된 문서만 다시 파싱
+    - 캐시된 결과를 공유하므로 호출측에서 수정 금지
+    """
+    path = Path(txt_file_path)
+    content = path.read_bytes()
+    # 텍스트 모드와 동일하게 줄바꿈 정규화 (CRLF가 있는 파일만)
+    if b'\r' in content:
+        content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    return summarize_document_structure(content, path.name)
+
+
+def load_document_summary(txt_file: Path) -> Dict[str, Any]:
+    """문서 구조적 요약 조회 (파일 크기/mtime 기준 캐시 사용)"""
+    st = txt_file.stat()
+    return _summarize_document_file(str(txt_file), st.st_size, st.st_mtime_ns)
+
+
+def select_top_abnormal_labs(all_labs: List[Dict], top_n: int = 15,
+                             status_counts: Optional[Counter] = None) -> List[Dict]:
     """
     가장 이상한 lab 결과 선택 (일반화)
     
@@ -145,8 +293,12 @@ def select_top_abnormal_labs(all_labs: List[Dict], top_n: int = 15) -> List[Dict
     1. ◆ (critical) 마크가 있는 것 우선
     2. ▲▼ 마크가 있는 것 중 상위
     3. 상대적 순위 (환자별 데이터 내에서)
+    
+    status_counts가 주어지면 같은 순회에서 상태별 개수도 집계
+    top_n은 0 이상 (summarize_medical_records에서 검증)
     """
     # 상태별 점수
+    # (정확한 정상범위 모르더라도, 화살표/문자값 상태만으로 판단)
     status_score = {
         'qualitative_abnormal': 100,  # ◆ (문자형 이상)
         'increased': 10,
@@ -154,30 +306,77 @@ def select_top_abnormal_labs(all_labs: List[Dict], top_n: int = 15) -> List[Dict
         'normal': 0
     }
     
-    # 각 lab에 점수 부여
-    scored_labs = []
+    # 점수가 100(◆)/10(▲▼) 두 단계뿐이므로 정렬 대신 두 bucket으로 분할
+    # (파일 순서 유지 = 기존 stable sort와 동일한 결과)
+    critical_labs = []
+    abnormal_labs = []
     for lab in all_labs:
-        base_score = status_score.get(lab['status'], 0)
+        status = lab['status']
+        if status_counts is not None:
+            status_counts[status] += 1
         
-        # 숫자값이 있으면 추가 고려
-        # (정확한 정상범위 모르더라도, 화살표만으로 판단)
-        if lab.get('value_numeric') is not None:
-            # critical/increased/decreased가 표시되어 있다면
-            # 그 자체로 의미있음
-            score = base_score
-        else:
-            # 문자값 (Negative, Positive 등)
-            # 상태가 abnormal이면 의미있음
-            score = base_score
+        if status == 'qualitative_abnormal':
+            critical_labs.append(lab)
+        elif status in ('increased', 'decreased'):
+            abnormal_labs.append(lab)
+    
+    selected = critical_labs[:top_n]
+    selected += abnormal_labs[:top_n - len(selected)]
+    
+    # 캐시된 lab 항목을 건드리지 않도록 복사본에 점수 기록
+    return [{**lab, 'selection_score': status_score[lab['status']]} for lab in selected]
+
+
+def _process_folder(folder: Path, top_n: int) -> Tuple[str, List[Dict], Optional[List[Dict]], Optional[Dict]]:
+    """
+    날짜 폴더 하나 처리 (문서 요약 + lab top/통계)
+    - 폴더 간 공유 상태가 없으므로 스레드에서 독립 실행 가능
+    - lab.csv가 없거나 읽을 수 없으면 top/통계는 None
+    """
+    date_str = folder.name
+    
+    # 문서 요약
+    doc_summaries = []
+    
+    # scandir 항목의 캐시된 메타데이터 사용 (glob("*.txt")처럼 숨김 파일 포함)
+    with os.scandir(folder) as entries:
+        txt_files = [Path(entry.path) for entry in entries
+                     if entry.name.endswith('.txt') and entry.is_file()]
+    for txt_file in txt_files:
+        if _EXCLUDE_FILE_RE.search(txt_file.name):
+            continue
         
-        lab['selection_score'] = score
-        if score > 0:  # abnormal한 것만
-            scored_labs.append(lab)
+        try:
+            doc_summaries.append(load_document_summary(txt_file))
+        except:
+            continue
+    
+    # Lab 데이터
+    lab_file = folder / "lab.csv"
+    if not lab_file.exists():
+        return date_str, doc_summaries, None, None
     
-    # 점수순 정렬
-    scored_labs.sort(key=lambda x: x['selection_score'], reverse=True)
+    try:
+        all_labs = load_labs(lab_file)
+    except Exception as e:
+        return date_str, doc_summaries, None, None
+    
+    # Top abnormal labs 선택 (일반화된 방법)
+    # (상태별 통계도 같은 순회에서 집계)
+    status_counts = Counter()
+    top_abnormal = select_top_abnormal_labs(all_labs, top_n=top_n, status_counts=status_counts)
+    
+    # 통계
+    stats = {
+        "total_tests": len(all_labs),
+        "normal": status_counts['normal'],
+        "increased": status_counts['increased'],
+        "decreased": status_counts['decreased'],
+        "qualitative_abnormal": status_counts['qualitative_abnormal'],
+        "showing_top": len(top_abnormal)
+    }
     
-    return scored_labs[:top_n]
+    return date_str, doc_summaries, top_abnormal, stats
 
 
 def collect_intelligent_summary(date_folders: List[Path], top_n: int = 15) -> Dict[str, Any]:
@@ -185,6 +384,7 @@ def collect_intelligent_summary(date_folders: List[Path], top_n: int = 15) -> Di
     지능형 요약 수집 (일반화)
     - 환자 독립적
     - 상대적 중요도 기반
+    - 날짜 폴더별 처리는 스레드 풀에서 병렬 실행 (파일 I/O 대기 중첩)
     """
     result = {
         "period_summary": {
@@ -203,90 +403,15 @@ def collect_intelligent_summary(date_folders: List[Path], top_n: int = 15) -> Di
         result["period_summary"]["end_date"] = dates[-1]
         result["period_summary"]["total_dates"] = len(dates)
     
-    for folder in sorted(date_folders):
-        date_str = folder.name
+    # ex.map은 입력 순서대로 결과를 돌려주므로 날짜 순서 유지
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(date_folders)))) as ex:
+        folder_results = ex.map(lambda folder: _process_folder(folder, top_n), sorted(date_folders))
         
-        # 문서 요약
-        result["documents_by_date"][date_str] = []
-        
-        txt_files = list(folder.glob("*.txt"))
-        for txt_file in txt_files:
-            if any(exclude in txt_file.name.lower() for exclude in ['input', 'output', 'requirements', 'readme']):
-                continue
-            
-            try:
-                with open(txt_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                doc_summary = summarize_document_structure(content, txt_file.name)
-                result["documents_by_date"][date_str].append(doc_summary)
-            except:
-                continue
-        
-        # Lab 데이터
-        lab_file = folder / "lab.csv"
-        if lab_file.exists():
-            all_labs = []
-            
-            try:
-                with open(lab_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        lab_name_raw = row.get('lab_name', '').strip()
-                        status = "normal"
-                        lab_name = lab_name_raw
-                        
-                        if lab_name_raw:
-                            if '(▼)' in lab_name_raw or lab_name_raw.startswith('▼'):
-                                status = "decreased"
-                                lab_name = re.sub(r'^\(▼\)\s*|^▼\s*', '', lab_name_raw)
-                            elif '(▲)' in lab_name_raw or lab_name_raw.startswith('▲'):
-                                status = "increased"
-                                lab_name = re.sub(r'^\(▲\)\s*|^▲\s*', '', lab_name_raw)
-                            elif '(◆)' in lab_name_raw or lab_name_raw.startswith('◆'):
-                                status = "qualitative_abnormal"  # 문자형 이상 (Positive 등)
-                                lab_name = re.sub(r'^\(◆\)\s*|^◆\s*', '', lab_name_raw)
-                        
-                        value_raw = row.get('lab_value', '').strip()
-                        value_numeric = parse_value(value_raw)
-                        
-                        # 문자형 결과 (Positive/Negative) 처리
-                        # 화살표가 없고 숫자도 아닌 경우
-                        if status == "normal" and value_numeric is None and value_raw:
-                            value_lower = value_raw.lower()
-                            # Positive 계열 → qualitative_abnormal
-                            if any(pos in value_lower for pos in ['positive', 'reactive', 'detected']):
-                                status = "qualitative_abnormal"
-                            # Negative 계열은 이미 normal (기본값)
-                        
-                        if lab_name and value_raw:
-                            lab_entry = {
-                                "test_name": lab_name,
-                                "value_raw": value_raw,
-                                "unit": row.get('lab_unit', '').strip(),
-                                "status": status
-                            }
-                            
-                            if value_numeric is not None:
-                                lab_entry["value_numeric"] = value_numeric
-                            
-                            all_labs.append(lab_entry)
-            except Exception as e:
-                continue
-            
-            # Top abnormal labs 선택 (일반화된 방법)
-            top_abnormal = select_top_abnormal_labs(all_labs, top_n=top_n)
-            result["top_abnormal_labs_by_date"][date_str] = top_abnormal
-            
-            # 통계
-            result["lab_statistics_by_date"][date_str] = {
-                "total_tests": len(all_labs),
-                "normal": len([x for x in all_labs if x['status'] == 'normal']),
-                "increased": len([x for x in all_labs if x['status'] == 'increased']),
-                "decreased": len([x for x in all_labs if x['status'] == 'decreased']),
-                "qualitative_abnormal": len([x for x in all_labs if x['status'] == 'qualitative_abnormal']),
-                "showing_top": len(top_abnormal)
-            }
+        for date_str, doc_summaries, top_abnormal, stats in folder_results:
+            result["documents_by_date"][date_str] = doc_summaries
+            if stats is not None:
+                result["top_abnormal_labs_by_date"][date_str] = top_abnormal
+                result["lab_statistics_by_date"][date_str] = stats
     
     return result
 
@@ -310,7 +435,7 @@ def summarize_medical_records(start_date: str = None, end_date: str = None, top_
     Args:
         start_date: 시작 날짜 (예: "20230308")
         end_date: 종료 날짜 (예: "20230310")
-        top_n: 날짜별 추출할 abnormal lab 개수 (기본: 15, 최대 30 권장)
+        top_n: 날짜별 추출할 abnormal lab 개수 (기본: 15, 최대 30 권장, 0 이상 - 음수면 오류 반환)
     
     Returns:
         지능형 요약 데이터
@@ -321,6 +446,11 @@ def summarize_medical_records(start_date: str = None, end_date: str = None, top_
                 "error": "LAB_WORK_DIR 환경변수가 설정되지 않았습니다."
             }, ensure_ascii=False, indent=2)
         
+        if top_n < 0:
+            return json.dumps({
+                "error": f"top_n은 0 이상이어야 합니다: {top_n}"
+            }, ensure_ascii=False, indent=2)
+        
         # 날짜 파싱
         try:
             start_date_parsed = parse_date(start_date) if start_date else None
@@ -338,14 +468,15 @@ def summarize_medical_records(start_date: str = None, end_date: str = None, top_
         
         # 날짜 폴더 필터링
         date_folders = []
-        for folder in base_path.iterdir():
-            if folder.is_dir() and re.match(r'^\d{8}$', folder.name):
-                folder_date = folder.name
-                if start_date_parsed and folder_date < start_date_parsed:
-                    continue
-                if end_date_parsed and folder_date > end_date_parsed:
-                    continue
-                date_folders.append(folder)
+        with os.scandir(base_path) as entries:
+            for entry in entries:
+                if _DATE8_RE.match(entry.name) and entry.is_dir():
+                    folder_date = entry.name
+                    if start_date_parsed and folder_date < start_date_parsed:
+                        continue
+                    if end_date_parsed and folder_date > end_date_parsed:
+                        continue
+                    date_folders.append(Path(entry.path))
         
         if not date_folders:
             return json.dumps({
@@ -359,15 +490,20 @@ def summarize_medical_records(start_date: str = None, end_date: str = None, top_
         # 지능형 요약 수집
         result = collect_intelligent_summary(date_folders, top_n=top_n)
         
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        # 데이터 응답은 compact JSON (토큰/바이트 절약), 오류 응답만 indent 유지
+        
+        return json.dumps(result, ensure_ascii=False, separators=(',', ':'))
         
     except Exception as e:
-        import traceback
-        return json.dumps({
+        error = {
             "error": "데이터 수집 중 오류",
-            "message": str(e),
-            "traceback": traceback.format_exc()
-        }, ensure_ascii=False, indent=2)
+            "message": repr(e)
+        }
+        # 전체 traceback은 비용이 크고 응답이 커지므로 MCP_DEBUG 설정 시에만 포함
+        if DEBUG:
+            import traceback
+            error["traceback"] = traceback.format_exc()
+        return json.dumps(error, ensure_ascii=False, indent=2)
 
 
 @mcp.tool()
@@ -395,52 +531,13 @@ def get_full_lab_data(date: str) -> str:
         if not lab_file.exists():
             return json.dumps({"error": f"lab.csv 파일이 없습니다: {date_parsed}"}, ensure_ascii=False)
         
-        lab_data = []
-        with open(lab_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                lab_name_raw = row.get('lab_name', '').strip()
-                status = "normal"
-                lab_name = lab_name_raw
-                
-                if lab_name_raw:
-                    if '(▼)' in lab_name_raw:
-                        status = "decreased"
-                        lab_name = re.sub(r'^\(▼\)\s*', '', lab_name_raw)
-                    elif '(▲)' in lab_name_raw:
-                        status = "increased"
-                        lab_name = re.sub(r'^\(▲\)\s*', '', lab_name_raw)
-                    elif '(◆)' in lab_name_raw:
-                        status = "qualitative_abnormal"
-                        lab_name = re.sub(r'^\(◆\)\s*', '', lab_name_raw)
-                
-                value_raw = row.get('lab_value', '').strip()
-                value_numeric = parse_value(value_raw)
-                
-                # 문자형 결과 (Positive/Negative) 처리
-                if status == "normal" and value_numeric is None and value_raw:
-                    value_lower = value_raw.lower()
-                    if any(pos in value_lower for pos in ['positive', 'reactive', 'detected']):
-                        status = "qualitative_abnormal"
-                
-                if lab_name and value_raw:
-                    lab_entry = {
-                        "test_name": lab_name,
-                        "value_raw": value_raw,
-                        "unit": row.get('lab_unit', '').strip(),
-                        "status": status
-                    }
-                    
-                    if value_numeric is not None:
-                        lab_entry["value_numeric"] = value_numeric
-                    
-                    lab_data.append(lab_entry)
+        lab_data = load_labs(lab_file)
         
         return json.dumps({
             "date": date_parsed,
             "lab_data": lab_data,
             "total_count": len(lab_data)
-        }, ensure_ascii=False, indent=2)
+        }, ensure_ascii=False, separators=(',', ':'))
         
     except Exception as e:
         return json.dumps({"error": str(e)}, ensure_ascii=False)
@@ -472,14 +569,13 @@ def get_document_content(date: str, filename: str) -> str:
         if not file_path.exists():
             return json.dumps({"error": f"파일이 없습니다: {filename}"}, ensure_ascii=False)
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = read_text(file_path)
         
         return json.dumps({
             "date": date_parsed,
             "filename": filename,
             "content": content
-        }, ensure_ascii=False, indent=2)
+        }, ensure_ascii=False, separators=(',', ':'))
         
     except Exception as e:
         return json.dumps({"error": str(e)}, ensure_ascii=False)
@@ -53,19 +53,115 @@ Best for:
 
 from fastmcp import FastMCP
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as URLLib3HTTPError
 import re
-from typing import List, Dict, Optional
-from collections import defaultdict
-import xml.etree.ElementTree as ET
-from urllib.parse import quote
+import os
+import logging
+import html
+import json
+from typing import List, Dict, Optional, Iterable, Iterator
+from collections import Counter, OrderedDict
+from lxml import etree
+from urllib.parse import quote, unquote_plus
+import asyncio
+import threading
 import time
-from bs4 import BeautifulSoup
+import random
+from email.utils import parsedate_to_datetime
+from functools import lru_cache, partial, wraps
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup, SoupStrainer
 
 mcp = FastMCP("Medical Literature Search Engine v11")
 
+# 로그는 stderr로 출력 (stdio MCP에서 stdout은 프로토콜 전용), 기본 WARNING → 검색 경로의 로그 포맷팅 비용 생략
+# 서버 전용 변수 사용 (컨테이너의 다른 도구가 쓰는 LOG_LEVEL과 분리), 알 수 없는 값이면 WARNING
+_LOG_LEVEL = logging.getLevelName(os.getenv("LIT_LOG_LEVEL", "WARNING").strip().upper())
+logging.basicConfig(level=_LOG_LEVEL if isinstance(_LOG_LEVEL, int) else logging.WARNING)
+logger = logging.getLogger(__name__)
+
 # 설정
-TIMEOUT = 30
+TIMEOUT = (3, 20)  # HTTP 요청당 (연결, 읽기) 제한 시간 (초)
+SEARCH_DEADLINE = 45  # 검색 1회 전체 제한 시간 (초) - 초과한 DB는 결과 없이 오류로 보고
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+DB_LABELS = {"pubmed": "PubMed", "pmc": "PMC", "koreamed": "KoreaMed"}
+ESEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+EFETCH_BATCH_SIZE = 200  # efetch 1회당 최대 레코드 수 (NCBI 권장)
+EXTERNAL_SEARCH_URLS = {
+    "PubMed": "https://pubmed.ncbi.nlm.nih.gov/?term={}",
+    "PMC": "https://www.ncbi.nlm.nih.gov/pmc/?term={}",
+    "KoreaMed": "https://koreamed.org/SearchBasic.php?RID=0&DT=1&QY={}",
+}
+SEARCH_CACHE_TTL = 600  # 동일 쿼리 결과 재사용 시간 (초)
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_ENABLED = os.getenv("LIT_SEARCH_CACHE", "1") != "0"  # 0이면 캐시/중복 요청 병합 비활성화 (항상 최신 결과)
+NCBI_API_KEY = os.getenv("NCBI_API_KEY")
+NCBI_EMAIL = os.getenv("NCBI_EMAIL")
+NCBI_RATE_LIMIT = 10 if NCBI_API_KEY else 3  # 초당 요청 수 (NCBI E-utilities 허용치: API key 있으면 10, 없으면 3)
+KOREAMED_RATE_LIMIT = 5  # 초당 요청 수 (KoreaMed 서버 보호용)
+MAX_RETRIES = 3  # 일시적 오류(429/5xx, 연결 오류) 재시도 횟수
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+RETRY_AFTER_MAX = 20  # 서버가 지정한 Retry-After 대기 상한 (초) - 검색 제한 시간 내에서만 대기
+RATE_LIMIT_COOLDOWN = 1.0  # 호스트 한도 소진(429, X-RateLimit-Remaining: 0) 시 다음 요청 지연 (초)
+SEARCH_WORKERS = 6  # DB 검색 전용 스레드 수 (DB 3개 × 동시 도구 호출 2건)
+
+# 모든 E-utilities 요청에 붙는 식별 파라미터 (api_key가 있어야 10 req/s 허용)
+NCBI_PARAMS = {"tool": "ddx-finder"}
+if NCBI_EMAIL:
+    NCBI_PARAMS["email"] = NCBI_EMAIL
+if NCBI_API_KEY:
+    NCBI_PARAMS["api_key"] = NCBI_API_KEY
+
+# DB 검색 전용 스레드 풀 (asyncio 기본 executor와 분리 → 다른 작업과 스레드 경쟁 없음)
+_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="lit-search")
+
+# 프로세스 전역 HTTP 세션 (도구 호출 간 keep-alive 연결 재사용 → TCP/TLS 핸드셰이크 절감)
+_SESSION = requests.Session()
+_SESSION.headers.update({'User-Agent': USER_AGENT})
+_SESSION.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=32))
+
+# 스트리밍 응답 파싱 중 소켓 읽기에서 발생하는 네트워크 오류 (파싱 오류와 구분해 검색 오류로 전파)
+NETWORK_ERRORS = (requests.RequestException, URLLib3HTTPError)
+
+# 정규식 (모듈 로드 시 1회 컴파일)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_NON_WORD_RE = re.compile(r'\W+')
+_SENT_SPLIT_RE = re.compile(r'[.!?]\s+')
+_RID_RE = re.compile(r'RID%3D(\d+)')
+_TEXT_RE = re.compile(r'text=([^&]+)')
+_TWITTER_RE = re.compile(r'twitter\.com/intent/tweet')
+
+# PMC(JATS) 필드 XPath (모듈 로드 시 1회 컴파일, 각 항목은 기존 find()와 같은 첫 번째 일치 요소)
+_XP_PMC_ARTICLE_IDS = etree.XPath('.//article-id')
+_XP_PMC_TITLE = etree.XPath('(.//article-title)[1]')
+_XP_PMC_ABSTRACT_PARAS = etree.XPath('(.//abstract)[1]//p')
+_XP_PMC_YEAR = etree.XPath('(.//pub-date)[1]/year[1]')
+_XP_PMC_JOURNAL = etree.XPath('(.//journal-title)[1]')
+_XP_PMC_AUTHOR_SURNAMES = etree.XPath('.//contrib[@contrib-type="author"]/descendant::surname[1]')
+
+_EMPTY_TITLES = frozenset({"no title", ""})
+_PLACEHOLDER_VALUES = frozenset({"", "n/a", "unknown"})  # 저자/연도 미상 표시값 (casefold 기준)
+COMPACT_HEADER = (
+    "## Results\n\n"
+    "| Title | Summary (≤70 words) | Link |\n"
+    "|-------|---------------------|------|\n"
+)
+# 상세 형식(초록 전체 포함) 논문 1편 템플릿
+_DETAIL_TMPL = (
+    "### [{i}] {title}\n\n"
+    "**ID:** {id}  \n"
+    "**Source:** {source}  \n"
+    "**Journal:** {journal} ({year})  \n"
+    "**Authors:** {authors}  \n"
+    "**URL:** {url}  \n\n"
+    "**Abstract:**  \n{abstract}\n\n"
+    "---\n\n"
+)
+_KOREAMED_STRAINER = SoupStrainer(['input', 'a'])
 
 # PubMed 쿼리 작성 상세 가이드 (고급 사용자용, PubMed 전용)
 PUBMED_QUERY_TIPS = """
@@ -165,8 +261,14 @@ def clean_text(text: str) -> str:
     """텍스트 정리 - HTML 태그 제거 및 공백 정리"""
     if not text:
         return ""
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'\s+', ' ', text)
+    # 대부분의 제목/초록 텍스트 노드에는 마크업이 없으므로 태그/엔티티 처리는 필요할 때만 수행
+    if '<' in text:
+        text = _HTML_TAG_RE.sub('', text)
+    if '&' in text:
+        text = html.unescape(text)
+    # 공백 정리도 연속 공백이나 탭/개행 등(비인쇄 문자)이 있을 때만 수행
+    if '  ' in text or not text.isprintable():
+        text = _WS_RE.sub(' ', text)
     return text.strip()
 
 
@@ -178,51 +280,55 @@ def extract_summary(abstract: str, max_words: int = 70) -> str:
     if not abstract or abstract == "No abstract":
         return "No abstract available"
     
-    # 문장 분리
-    sentences = re.split(r'[.!?]\s+', abstract)
-    summary = ""
+    # 문장 분리 - 앞 3문장만 잘라냄 (긴 초록 전체를 분할하지 않음)
+    sentences = []
+    start = 0
+    for match in _SENT_SPLIT_RE.finditer(abstract):
+        sentences.append(abstract[start:match.start()])
+        start = match.end()
+        if len(sentences) == 3:  # 최대 3문장
+            break
+    else:
+        sentences.append(abstract[start:])
+    
+    kept = []
     word_count = 0
     
-    for sentence in sentences[:3]:  # 최대 3문장
-        words = sentence.split()
-        if word_count + len(words) <= max_words:
-            summary += sentence + ". "
-            word_count += len(words)
-        else:
+    for sentence in sentences:
+        words = len(sentence.split())
+        if word_count + words > max_words:
             break
+        kept.append(sentence)
+        word_count += words
     
-    if not summary:
+    if not kept:
         # 첫 문장이 70단어 초과하는 경우
-        words = sentences[0].split()[:max_words]
-        summary = " ".join(words) + "..."
+        words = sentences[0].split(None, max_words)[:max_words]
+        return (" ".join(words) + "...").strip()
     
-    return summary.strip()
+    return (". ".join(kept) + ".").strip()
+
+
+@lru_cache(maxsize=256)
+def quote_query(query: str) -> str:
+    """쿼리 URL 인코딩 (동일 쿼리는 DB별로 반복 인코딩하지 않음)"""
+    return quote(query)
 
 
-def format_results_compact(results: List[Dict]) -> str:
+def format_compact_row(article: Dict) -> str:
     """
-    토큰 효율적인 간결한 테이블 출력
+    토큰 효율적인 간결한 테이블의 한 행
     제목, 요약(70단어), 링크만 표시
     """
-    if not results:
-        return "No results found."
+    title = article['title']
+    summary = extract_summary(article.get('abstract', ''), max_words=70)
+    link = f"[{article['id']}]({article['url']})"
     
-    output = "## Results\n\n"
-    output += "| Title | Summary (≤70 words) | Link |\n"
-    output += "|-------|---------------------|------|\n"
+    # 테이블 셀에서 파이프 문자 이스케이프
+    title = title.replace('\n', ' ').replace('|', '\\|')
+    summary = summary.replace('\n', ' ').replace('|', '\\|')
     
-    for article in results:
-        title = article['title']
-        summary = extract_summary(article.get('abstract', ''), max_words=70)
-        link = f"[{article['id']}]({article['url']})"
-        
-        # 테이블 셀에서 파이프 문자 이스케이프
-        title = title.replace('\n', ' ').replace('|', '\\|')
-        summary = summary.replace('\n', ' ').replace('|', '\\|')
-        
-        output += f"| {title} | {summary} | {link} |\n"
-    
-    return output
+    return f"| {title} | {summary} | {link} |\n"
 
 
 def generate_execution_summary(search_details: List[Dict], debug_info: Dict = None) -> str:
@@ -234,9 +340,12 @@ def generate_execution_summary(search_details: List[Dict], debug_info: Dict = No
     - 외부 검색 링크
     - 디버깅 정보 (선택적)
     """
-    output = "## Search Execution Summary\n\n"
-    output += "| Database | Query Used | Query Translation | Results | Status |\n"
-    output += "|----------|------------|-------------------|---------|--------|\n"
+    parts = [
+        "## Search Execution Summary\n\n",
+        "| Database | Query Used | Query Translation | Results | Status |\n",
+        "|----------|------------|-------------------|---------|--------|\n",
+    ]
+    parts_append = parts.append
     
     for detail in search_details:
         db = detail['database']
@@ -260,42 +369,191 @@ def generate_execution_summary(search_details: List[Dict], debug_info: Dict = No
             status = "✅ Success"
         else:
             status = "❌ No results"
+        if detail.get('cached'):
+            status += " (cached)"
         
-        output += f"| {db} | `{query_display}` | {translation} | {count} | {status} |\n"
+        parts_append(f"| {db} | `{query_display}` | {translation} | {count} | {status} |\n")
     
-    output += "\n"
+    parts_append("\n")
     
     # 외부 검색 링크 제공 (더 많은 결과 탐색)
-    output += "### 🔗 Search More Results Externally\n\n"
-    output += "Due to token limitations, only a subset of results is shown. "
-    output += "Use these direct links to explore more results:\n\n"
+    parts_append("### 🔗 Search More Results Externally\n\n")
+    parts_append("Due to token limitations, only a subset of results is shown. ")
+    parts_append("Use these direct links to explore more results:\n\n")
     
     for detail in search_details:
         if detail['result_count'] > 0:
             db = detail['database']
             query = detail['executed_query']
             
-            if db == "PubMed":
-                url = f"https://pubmed.ncbi.nlm.nih.gov/?term={quote(query)}"
-                output += f"- **{db}**: [Search on PubMed]({url})\n"
-            elif db == "PMC":
-                url = f"https://www.ncbi.nlm.nih.gov/pmc/?term={quote(query)}"
-                output += f"- **{db}**: [Search on PMC]({url})\n"
-            elif db == "KoreaMed":
-                url = f"https://koreamed.org/SearchBasic.php?RID=0&DT=1&QY={quote(query)}"
-                output += f"- **{db}**: [Search on KoreaMed]({url})\n"
-    
-    output += "\n"
+            url_template = EXTERNAL_SEARCH_URLS.get(db)
+            if url_template:
+                url = url_template.format(quote_query(query))
+                parts_append(f"- **{db}**: [Search on {db}]({url})\n")
+    
+    parts_append("\n")
     
     # 디버깅 정보 추가 (PMC ID 통계)
     if debug_info and "pmc_id_stats" in debug_info:
         stats = debug_info["pmc_id_stats"]
         if stats["with_pmc_id"] > 0 or stats["pmid_fallback"] > 0:
-            output += "### 🔍 PMC Search Details\n\n"
-            output += f"- **With PMC ID**: {stats['with_pmc_id']} articles (full-text available on PMC)\n"
-            output += f"- **PMID Fallback**: {stats['pmid_fallback']} articles (PubMed links, no PMC full-text)\n\n"
+            parts_append("### 🔍 PMC Search Details\n\n")
+            parts_append(f"- **With PMC ID**: {stats['with_pmc_id']} articles (full-text available on PMC)\n")
+            parts_append(f"- **PMID Fallback**: {stats['pmid_fallback']} articles (PubMed links, no PMC full-text)\n\n")
     
-    return output
+    return "".join(parts)
+
+
+class TTLCache:
+    """스레드 안전 LRU + TTL 캐시 (동일 쿼리 재검색 시 네트워크/XML 파싱 생략)"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._data)
+            self._data.clear()
+            return count
+
+
+_SEARCH_CACHE = TTLCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL)
+
+# 진행 중인 검색 (동일 키의 동시 요청은 먼저 시작한 검색 결과를 기다려 재사용)
+_IN_FLIGHT = {}
+_IN_FLIGHT_LOCK = threading.Lock()
+
+
+def search_cache_key(database: str, query: str, max_results: int) -> tuple:
+    """검색 캐시 키 - 공백 차이만 정규화 (Boolean 연산자는 대문자여야 하므로 소문자 변환 안 함)"""
+    return (database, " ".join(query.split()), max_results)
+
+
+def cached_search(database: str):
+    """검색 메서드 데코레이터 - TTL 캐시 조회 + 진행 중인 동일 검색과 요청 병합"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, query: str, max_results: int = 20, *args, **kwargs):
+            if not SEARCH_CACHE_ENABLED:
+                return method(self, query, max_results, *args, **kwargs)
+            
+            key = search_cache_key(database, query, max_results)
+            while True:
+                cached = self._load_cached(database, query, max_results)
+                if cached is not None:
+                    return cached
+                
+                with _IN_FLIGHT_LOCK:
+                    pending = _IN_FLIGHT.get(key)
+                    if pending is None:
+                        pending = _IN_FLIGHT[key] = threading.Event()
+                        break
+                
+                # 먼저 시작한 검색이 끝나면 캐시를 다시 확인 (실패했으면 직접 검색)
+                pending.wait()
+            
+            try:
+                return method(self, query, max_results, *args, **kwargs)
+            finally:
+                with _IN_FLIGHT_LOCK:
+                    del _IN_FLIGHT[key]
+                pending.set()
+        return wrapper
+    return decorator
+
+
+class RateLimiter:
+    """스레드 안전 최소 간격 레이트 리미터 (호스트별 1개, 동시 검색 스레드 간 요청 간격 보장)"""
+    
+    def __init__(self, rate: float):
+        self.min_interval = 1.0 / rate
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        # 락 안에서는 다음 슬롯만 예약하고, 대기는 락 밖에서 수행
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+    
+    def defer(self, delay: float) -> None:
+        """다음 요청 슬롯을 delay초 뒤로 미룸 (429/Retry-After 등 서버 측 제한 반영)"""
+        with self._lock:
+            self._next_time = max(self._next_time, time.monotonic() + delay)
+
+
+# 호스트별 리미터 - NCBI 제한이 KoreaMed 요청을 늦추지 않도록 분리
+_NCBI_LIMITER = RateLimiter(NCBI_RATE_LIMIT)
+_KOREAMED_LIMITER = RateLimiter(KOREAMED_RATE_LIMIT)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Retry-After 헤더 해석 - 초 단위 정수 또는 HTTP-date 형식 지원, 해석 불가 시 None"""
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def efetch_params(db: str, search_data: Dict, ids: List[str], retstart: int = 0) -> Dict:
+    """esearch(usehistory=y) 결과의 WebEnv/query_key로 efetch 파라미터 구성 (없으면 ID 목록 사용)"""
+    webenv = search_data.get("webenv")
+    query_key = search_data.get("querykey")
+    if webenv and query_key:
+        return {
+            "db": db,
+            "WebEnv": webenv,
+            "query_key": query_key,
+            "retstart": retstart,
+            "retmax": len(ids),
+            "retmode": "xml",
+            **NCBI_PARAMS
+        }
+    return {"db": db, "id": ",".join(ids), "retmode": "xml", **NCBI_PARAMS}
+
+
+def iter_xml_records(xml_stream, tag: str):
+    """
+    efetch XML 스트림에서 tag 레코드(논문)를 하나씩 반환 (lxml iterparse)
+    호출 측이 다음 레코드로 넘어가면(건너뛴 경우 포함) 이전 레코드와 앞선 형제 요소를 해제
+    → 배치 크기와 무관하게 메모리는 논문 1편 크기로 유지
+    """
+    for _, elem in etree.iterparse(xml_stream, tag=tag, huge_tree=True, recover=True):
+        yield elem
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
 
 
 class DatabaseSearcher:
@@ -306,9 +564,122 @@ class DatabaseSearcher:
         self.errors = []
         self.search_details = []  # 검색 상세 정보
         self.debug_info = {"pmc_id_stats": {"with_pmc_id": 0, "pmid_fallback": 0}}  # 디버깅 정보
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': USER_AGENT})
+        self.session = _SESSION
+        # DB 이름(소문자) → 검색 메서드
+        self.dispatch = {
+            "pubmed": self.search_pubmed,
+            "pmc": self.search_pmc,
+            "koreamed": self.search_koreamed,
+        }
+    
+    def _load_cached(self, database: str, query: str, max_results: int) -> Optional[List[Dict]]:
+        """캐시 적중 시 결과 반환 및 검색 상세 기록 (미적중 시 None)"""
+        if not SEARCH_CACHE_ENABLED:
+            return None
+        
+        cached = _SEARCH_CACHE.get(search_cache_key(database, query, max_results))
+        if cached is None:
+            return None
+        
+        results, query_translation = cached
+        logger.info("[%s] ♻️ Using cached results (%s)", database, len(results))
+        
+        if database == "PMC":
+            stats = self.debug_info["pmc_id_stats"]
+            for result in results:
+                if result["source"] == "PMC":
+                    stats["with_pmc_id"] += 1
+                else:
+                    stats["pmid_fallback"] += 1
+        
+        self.search_details.append({
+            "database": database,
+            "original_query": query,
+            "executed_query": query,
+            "query_translation": query_translation,
+            "result_count": len(results),
+            "cached": True
+        })
+        return list(results)
+    
+    def _store_cached(self, database: str, query: str, max_results: int, results: List[Dict], query_translation: str) -> None:
+        """정상 응답으로 얻은 파싱 결과를 캐시에 저장"""
+        if SEARCH_CACHE_ENABLED:
+            _SEARCH_CACHE.set(search_cache_key(database, query, max_results), (list(results), query_translation))
+    
+    def _request(self, method: str, url: str, limiter: Optional[RateLimiter] = None, **kwargs) -> requests.Response:
+        """HTTP 요청 - 레이트 리밋 준수, 일시적 오류 시 지수 백오프로 재시도 (재시도도 limiter를 거침)"""
+        for attempt in range(MAX_RETRIES + 1):
+            if limiter is not None:
+                limiter.acquire()
+            delay = 0.25 * 2 ** attempt + random.random() * 0.1
+            try:
+                response = self.session.request(method, url, timeout=TIMEOUT, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == MAX_RETRIES:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS or attempt == MAX_RETRIES:
+                    if limiter is not None and (response.status_code == 429 or response.headers.get("X-RateLimit-Remaining") == "0"):
+                        # 호스트 한도 소진 → 같은 호스트를 쓰는 다른 스레드도 다음 요청을 미룸
+                        limiter.defer(RATE_LIMIT_COOLDOWN)
+                    return response
+                # 서버가 Retry-After로 대기 시간을 지정하면 그만큼 기다림 (RETRY_AFTER_MAX 상한)
+                retry_after = parse_retry_after(response.headers.get("Retry-After", ""))
+                if retry_after is not None:
+                    delay = max(delay, min(retry_after, RETRY_AFTER_MAX))
+                response.close()
+            if limiter is not None:
+                # 같은 호스트를 쓰는 다른 스레드도 함께 대기 (acquire에서 반영)
+                limiter.defer(delay)
+            else:
+                time.sleep(delay)
+    
+    def _esearch(self, db: str, query: str, max_results: int, **extra_params) -> Optional[Dict]:
+        """NCBI esearch (usehistory=y) 실행 - esearchresult 반환, HTTP 오류 시 None"""
+        params = {
+            "db": db,
+            "term": query,
+            "retmax": max_results,
+            "retmode": "json",
+            "usehistory": "y",
+            **extra_params,
+            **NCBI_PARAMS
+        }
+        response = self._request("GET", ESEARCH_URL, _NCBI_LIMITER, params=params)
+        if response.status_code != 200:
+            logger.warning("[%s] ❌ Search failed (HTTP %s)", db, response.status_code)
+            return None
+        # 바이트 그대로 디코딩 (requests의 인코딩 추정/str 변환 단계 생략)
+        return json.loads(response.content).get("esearchresult", {})
     
+    def _efetch(self, db: str, search_data: Dict, ids: List[str], parse_xml) -> tuple:
+        """
+        NCBI efetch 실행 - History 서버(WebEnv)에서 EFETCH_BATCH_SIZE개씩 조회하고 스트리밍 응답을 바로 파싱
+        (결과, 전체 배치 성공 여부) 반환 - 실패한 배치는 self.errors에 기록
+        """
+        results = []
+        for retstart in range(0, len(ids), EFETCH_BATCH_SIZE):
+            batch_ids = ids[retstart:retstart + EFETCH_BATCH_SIZE]
+            with self._request(
+                "GET",
+                EFETCH_URL,
+                _NCBI_LIMITER,
+                params=efetch_params(db, search_data, batch_ids, retstart),
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    logger.warning("[%s] ❌ Fetch failed (HTTP %s)", db, response.status_code)
+                    self.errors.append({
+                        "database": DB_LABELS[db],
+                        "error": f"Fetch failed for records {retstart + 1}-{retstart + len(batch_ids)} (HTTP {response.status_code})"
+                    })
+                    return results, False
+                response.raw.decode_content = True
+                results.extend(parse_xml(response.raw, batch_ids))
+        return results, True
+    
+    @cached_search("PubMed")
     def search_pubmed(
         self, 
         query: str, 
@@ -324,24 +695,12 @@ class DatabaseSearcher:
         query_translation = "N/A"
         
         try:
-            print(f"  🔍 Searching PubMed...")
-            print(f"      Query: {query[:100]}...")
+            logger.debug("[PubMed] 🔍 Searching: %.100s", query)
             
             # 1. 검색 수행
-            search_response = self.session.get(
-                "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi",
-                params={
-                    "db": "pubmed",
-                    "term": query,
-                    "retmax": max_results,
-                    "retmode": "json",
-                    "sort": "relevance"
-                },
-                timeout=TIMEOUT
-            )
+            search_data = self._esearch("pubmed", query, max_results, sort="relevance")
             
-            if search_response.status_code == 200:
-                search_data = search_response.json().get("esearchresult", {})
+            if search_data is not None:
                 pmids = search_data.get("idlist", [])
                 
                 # QueryTranslation 추출
@@ -349,24 +708,15 @@ class DatabaseSearcher:
                 
                 if pmids:
                     # 2. 논문 상세 정보 가져오기
-                    fetch_response = self.session.get(
-                        "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi",
-                        params={
-                            "db": "pubmed",
-                            "id": ",".join(pmids),
-                            "retmode": "xml"
-                        },
-                        timeout=TIMEOUT
-                    )
-                    
-                    if fetch_response.status_code == 200:
-                        results = self._parse_pubmed_xml(fetch_response.text, pmids)
-                        print(f"      ✅ Found {len(results)} results")
-                        print(f"      QueryTranslation: {query_translation[:100]}...")
+                    results, complete = self._efetch("pubmed", search_data, pmids, self._parse_pubmed_xml)
+                    # 일부 배치가 실패한 불완전한 결과는 캐시하지 않음
+                    if results and complete:
+                        self._store_cached("PubMed", query, max_results, results, query_translation)
+                    logger.info("[PubMed] ✅ Found %s results", len(results))
+                    logger.debug("[PubMed] QueryTranslation: %.100s...", query_translation)
                 else:
-                    print(f"      ℹ️ No results found")
-            else:
-                print(f"      ❌ Search failed (HTTP {search_response.status_code})")
+                    logger.info("[PubMed] ℹ️ No results found")
+                    self._store_cached("PubMed", query, max_results, results, query_translation)
             
             # 검색 상세 기록
             self.search_details.append({
@@ -378,28 +728,50 @@ class DatabaseSearcher:
             })
                 
         except Exception as e:
-            print(f"      ❌ Error: {str(e)}")
+            logger.error("[PubMed] ❌ Error: %s", e)
             self.errors.append({"database": "PubMed", "error": str(e)})
         
         return results
     
-    def _parse_pubmed_xml(self, xml_text: str, pmids: List[str]) -> List[Dict]:
+    def _parse_pubmed_xml(self, xml_stream, pmids: List[str]) -> List[Dict]:
         """PubMed XML 파싱 - 원래 pmids 순서 유지"""
         articles_dict = {}  # PMID를 키로 하는 딕셔너리
+        pmid_set = set(pmids)
         
         try:
-            root = ET.fromstring(xml_text)
-            for article_elem in root.findall('.//PubmedArticle'):
-                pmid_elem = article_elem.find('.//PMID')
+            for article_elem in iter_xml_records(xml_stream, 'PubmedArticle'):
+                # 서브트리를 한 번만 순회하며 필요한 요소 수집 (필드별 .// 검색 반복 제거)
+                pmid_elem = title_elem = year_elem = journal_elem = None
+                abstract_elems = []
+                authors = []
+                for elem in article_elem.iter():
+                    tag = elem.tag
+                    if tag == 'PMID':
+                        if pmid_elem is None:
+                            pmid_elem = elem
+                    elif tag == 'ArticleTitle':
+                        if title_elem is None:
+                            title_elem = elem
+                    elif tag == 'AbstractText':
+                        abstract_elems.append(elem)
+                    elif tag == 'Year':
+                        if year_elem is None and elem.getparent().tag == 'PubDate':
+                            year_elem = elem
+                    elif tag == 'Title':
+                        if journal_elem is None and elem.getparent().tag == 'Journal':
+                            journal_elem = elem
+                    elif tag == 'LastName':
+                        if elem.text and elem.getparent().tag == 'Author':
+                            authors.append(elem.text)
+                
                 if pmid_elem is None:
                     continue
                 
                 pmid = pmid_elem.text
-                if pmid not in pmids:
+                if pmid not in pmid_set:
                     continue
                 
                 # 제목 추출 - text가 None이거나 비어있거나 [Not Available]인 경우 처리
-                title_elem = article_elem.find('.//ArticleTitle')
                 title = None
                 if title_elem is not None and title_elem.text:
                     title_text = clean_text(title_elem.text)
@@ -409,27 +781,19 @@ class DatabaseSearcher:
                 
                 # 제목이 없는 경우, Abstract의 첫 문장 사용
                 if not title:
-                    abstract_elem = article_elem.find('.//AbstractText')
-                    if abstract_elem is not None and abstract_elem.text:
-                        first_sentence = clean_text(abstract_elem.text).split('.')[0][:100]
+                    if abstract_elems and abstract_elems[0].text:
+                        first_sentence = clean_text(abstract_elems[0].text).split('.')[0][:100]
                         title = f"{first_sentence}..."
                     else:
                         title = f"[No title available - PMID:{pmid}]"
                 
-                abstract_parts = [clean_text(elem.text) for elem in article_elem.findall('.//AbstractText') if elem.text]
+                abstract_parts = [clean_text(elem.text) for elem in abstract_elems if elem.text]
                 abstract = " ".join(abstract_parts) if abstract_parts else "No abstract"
                 
-                year_elem = article_elem.find('.//PubDate/Year')
                 year = year_elem.text if year_elem is not None else "Unknown"
                 
-                journal_elem = article_elem.find('.//Journal/Title')
                 journal = clean_text(journal_elem.text if journal_elem is not None else "Unknown")
                 
-                authors = []
-                for author_elem in article_elem.findall('.//Author'):
-                    lastname = author_elem.find('LastName')
-                    if lastname is not None and lastname.text:
-                        authors.append(lastname.text)
                 author_str = ", ".join(authors[:3]) + (" et al." if len(authors) > 3 else "")
                 
                 # 딕셔너리에 저장 (순서 무관)
@@ -443,13 +807,17 @@ class DatabaseSearcher:
                     "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
                     "source": "PubMed"
                 }
+        except NETWORK_ERRORS:
+            # 응답 수신 중단 → 일부만 파싱된 결과를 성공으로 취급(캐시)하지 않도록 검색 오류로 전파
+            raise
         except Exception as e:
-            print(f"      ⚠️ XML parsing error: {e}")
+            logger.warning("[PubMed] ⚠️ XML parsing error: %s", e)
         
         # ✅ 원래 pmids 순서대로 재정렬
         articles = [articles_dict[pmid] for pmid in pmids if pmid in articles_dict]
         return articles
     
+    @cached_search("PMC")
     def search_pmc(
         self, 
         query: str, 
@@ -464,23 +832,12 @@ class DatabaseSearcher:
         query_translation = "N/A"
         
         try:
-            print(f"  🔍 Searching PMC...")
-            print(f"      Query: {query[:100]}...")
+            logger.debug("[PMC] 🔍 Searching: %.100s", query)
             
             # 1. 검색 수행
-            search_response = self.session.get(
-                "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi",
-                params={
-                    "db": "pmc",
-                    "term": query,
-                    "retmax": max_results,
-                    "retmode": "json"
-                },
-                timeout=TIMEOUT
-            )
+            search_data = self._esearch("pmc", query, max_results)
             
-            if search_response.status_code == 200:
-                search_data = search_response.json().get("esearchresult", {})
+            if search_data is not None:
                 pmcids = search_data.get("idlist", [])
                 
                 # QueryTranslation 추출
@@ -488,24 +845,15 @@ class DatabaseSearcher:
                 
                 if pmcids:
                     # 2. 논문 상세 정보 가져오기
-                    fetch_response = self.session.get(
-                        "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi",
-                        params={
-                            "db": "pmc",
-                            "id": ",".join(pmcids),
-                            "retmode": "xml"
-                        },
-                        timeout=TIMEOUT
-                    )
-                    
-                    if fetch_response.status_code == 200:
-                        results = self._parse_pmc_xml(fetch_response.text, pmcids)
-                        print(f"      ✅ Found {len(results)} results")
-                        print(f"      QueryTranslation: {query_translation[:100]}...")
+                    results, complete = self._efetch("pmc", search_data, pmcids, self._parse_pmc_xml)
+                    # 일부 배치가 실패한 불완전한 결과는 캐시하지 않음
+                    if results and complete:
+                        self._store_cached("PMC", query, max_results, results, query_translation)
+                    logger.info("[PMC] ✅ Found %s results", len(results))
+                    logger.debug("[PMC] QueryTranslation: %.100s...", query_translation)
                 else:
-                    print(f"      ℹ️ No results found")
-            else:
-                print(f"      ❌ Search failed (HTTP {search_response.status_code})")
+                    logger.info("[PMC] ℹ️ No results found")
+                    self._store_cached("PMC", query, max_results, results, query_translation)
             
             # 검색 상세 기록
             self.search_details.append({
@@ -517,27 +865,25 @@ class DatabaseSearcher:
             })
                 
         except Exception as e:
-            print(f"      ❌ Error: {str(e)}")
+            logger.error("[PMC] ❌ Error: %s", e)
             self.errors.append({"database": "PMC", "error": str(e)})
         
         return results
     
-    def _parse_pmc_xml(self, xml_text: str, pmcids: List[str]) -> List[Dict]:
+    def _parse_pmc_xml(self, xml_stream, pmcids: List[str]) -> List[Dict]:
         """PMC XML 파싱 - PMC ID 우선, 없으면 PMID 사용 (Fallback), 원래 pmcids 순서 유지"""
         articles_dict = {}  # PMC ID를 키로 하는 딕셔너리
         pmcid_mapping = {}  # article 요소를 PMC ID로 매핑
         
         try:
-            root = ET.fromstring(xml_text)
-            
-            for article_elem in root.findall('.//article'):
+            for article_elem in iter_xml_records(xml_stream, 'article'):
                 # PMC ID와 PubMed ID 찾기
                 # 우선순위: PMC ID > PMID
                 pmc_id = None
                 pmid = None
                 
                 # 모든 article-id를 순회하며 PMC ID와 PMID를 찾음
-                for article_id in article_elem.findall('.//article-id'):
+                for article_id in _XP_PMC_ARTICLE_IDS(article_elem):
                     id_type = article_id.get('pub-id-type')
                     
                     # PMC ID 찾기 (pmc, pmcid 둘 다 확인)
@@ -552,41 +898,28 @@ class DatabaseSearcher:
                 
                 # PMC ID도 PMID도 없으면 건너뜀
                 if not pmc_id and not pmid:
-                    print(f"      ⚠️ Skipping article without any ID")
+                    logger.warning("[PMC] ⚠️ Skipping article without any ID")
                     continue
                 
                 # 제목
-                title_elem = article_elem.find('.//article-title')
-                title = clean_text(title_elem.text if title_elem is not None else "No title")
+                title_elems = _XP_PMC_TITLE(article_elem)
+                title = clean_text(title_elems[0].text if title_elems else "No title")
                 
                 # 초록
-                abstract_parts = []
-                abstract_elem = article_elem.find('.//abstract')
-                if abstract_elem is not None:
-                    for p_elem in abstract_elem.findall('.//p'):
-                        if p_elem.text:
-                            abstract_parts.append(clean_text(p_elem.text))
+                abstract_parts = [clean_text(p_elem.text) for p_elem in _XP_PMC_ABSTRACT_PARAS(article_elem) if p_elem.text]
                 
                 abstract = " ".join(abstract_parts) if abstract_parts else "No abstract available"
                 
                 # 출판 연도
-                year = "Unknown"
-                pub_date = article_elem.find('.//pub-date')
-                if pub_date is not None:
-                    year_elem = pub_date.find('year')
-                    if year_elem is not None and year_elem.text:
-                        year = year_elem.text
+                year_elems = _XP_PMC_YEAR(article_elem)
+                year = year_elems[0].text if year_elems and year_elems[0].text else "Unknown"
                 
                 # 저널
-                journal_elem = article_elem.find('.//journal-title')
-                journal = clean_text(journal_elem.text if journal_elem is not None else "Unknown Journal")
+                journal_elems = _XP_PMC_JOURNAL(article_elem)
+                journal = clean_text(journal_elems[0].text if journal_elems else "Unknown Journal")
                 
                 # 저자
-                authors = []
-                for contrib_elem in article_elem.findall('.//contrib[@contrib-type="author"]'):
-                    surname_elem = contrib_elem.find('.//surname')
-                    if surname_elem is not None and surname_elem.text:
-                        authors.append(surname_elem.text)
+                authors = [surname.text for surname in _XP_PMC_AUTHOR_SURNAMES(article_elem) if surname.text]
                 author_str = ", ".join(authors[:3]) + (" et al." if len(authors) > 3 else "")
                 
                 # PMC ID가 있으면 PMC 링크, 없으면 PubMed 링크 사용
@@ -596,7 +929,7 @@ class DatabaseSearcher:
                     source = "PMC"
                     self.debug_info["pmc_id_stats"]["with_pmc_id"] += 1
                     # 디버깅: PMC ID 확인
-                    print(f"      ✅ PMC ID found: PMC{pmc_id} - {title[:40]}...")
+                    logger.debug("[PMC] ✅ PMC ID found: PMC%s - %.40s...", pmc_id, title)
                     
                     # PMC ID를 키로 저장
                     lookup_id = pmc_id
@@ -607,7 +940,7 @@ class DatabaseSearcher:
                     source = "PMC (via PubMed)"  # 출처 표시
                     self.debug_info["pmc_id_stats"]["pmid_fallback"] += 1
                     # 디버깅: Fallback 사용
-                    print(f"      ⚠️ No PMC ID, using PMID:{pmid} - {title[:40]}...")
+                    logger.debug("[PMC] ⚠️ No PMC ID, using PMID:%s - %.40s...", pmid, title)
                     
                     # pmcids에는 PMC ID 형식으로 저장되어 있으므로 확인 필요
                     lookup_id = None
@@ -635,13 +968,17 @@ class DatabaseSearcher:
                         "source": source
                     }
                 
+        except NETWORK_ERRORS:
+            # 응답 수신 중단 → 일부만 파싱된 결과를 성공으로 취급(캐시)하지 않도록 검색 오류로 전파
+            raise
         except Exception as e:
-            print(f"      ⚠️ PMC XML parsing error: {e}")
+            logger.warning("[PMC] ⚠️ PMC XML parsing error: %s", e)
         
         # ✅ 원래 pmcids 순서대로 재정렬
         articles = [articles_dict[pmcid] for pmcid in pmcids if pmcid in articles_dict]
         return articles
     
+    @cached_search("KoreaMed")
     def search_koreamed(
         self, 
         query: str, 
@@ -656,8 +993,7 @@ class DatabaseSearcher:
         query_translation = "N/A"
         
         try:
-            print(f"  🔍 Searching KoreaMed...")
-            print(f"      Query: {query[:100]}...")
+            logger.debug("[KoreaMed] 🔍 Searching: %.100s", query)
             
             # 검색 요청
             search_url = "https://koreamed.org/SearchBasic.php"
@@ -665,11 +1001,11 @@ class DatabaseSearcher:
                 "query_search": query  # 사용자 쿼리 그대로 사용
             }
             
-            response = self.session.post(search_url, data=data, timeout=TIMEOUT)
+            response = self._request("POST", search_url, _KOREAMED_LIMITER, data=data)
             
             if response.status_code == 200:
-                html_content = response.text
-                soup = BeautifulSoup(html_content, 'html.parser')
+                # 필요한 태그(input, a)만 트리로 구성 - 나머지 마크업은 파싱 단계에서 건너뜀
+                soup = BeautifulSoup(response.content, 'lxml', parse_only=_KOREAMED_STRAINER)
                 
                 # QueryTranslation 추출 시도
                 # KoreaMed는 검색창(input)의 value 속성에 변환된 쿼리가 들어있을 수 있음
@@ -678,26 +1014,26 @@ class DatabaseSearcher:
                     query_translation = query_input.get('value')
                 
                 # 결과 추출 (Twitter 공유 링크 방식)
-                twitter_links = soup.find_all('a', href=re.compile(r'twitter\.com/intent/tweet'))
+                twitter_links = soup.find_all('a', href=_TWITTER_RE)
                 
-                print(f"      Found {len(twitter_links)} potential results")
+                logger.debug("[KoreaMed] Found %s potential results", len(twitter_links))
                 
                 for link in twitter_links[:max_results]:
                     href = link.get('href', '')
                     
                     # RID 추출
-                    rid_match = re.search(r'RID%3D(\d+)', href)
+                    rid_match = _RID_RE.search(href)
                     if not rid_match:
                         continue
                     
                     rid = rid_match.group(1)
                     
                     # 제목 추출
-                    text_match = re.search(r'text=([^&]+)', href)
+                    text_match = _TEXT_RE.search(href)
                     if text_match:
                         encoded_text = text_match.group(1)
                         title_part = encoded_text.split('%0A')[0]
-                        title = requests.utils.unquote(title_part.replace('+', ' '))
+                        title = unquote_plus(title_part)
                     else:
                         title = "Unknown"
                     
@@ -714,14 +1050,16 @@ class DatabaseSearcher:
                         "source": "KoreaMed"
                     })
                 
+                self._store_cached("KoreaMed", query, max_results, results, query_translation)
+                
                 if len(results) > 0:
-                    print(f"      ✅ Found {len(results)} results")
+                    logger.info("[KoreaMed] ✅ Found %s results", len(results))
                     if query_translation != "N/A":
-                        print(f"      QueryTranslation: {query_translation[:100]}...")
+                        logger.debug("[KoreaMed] QueryTranslation: %.100s...", query_translation)
                 else:
-                    print(f"      ℹ️ No results found")
+                    logger.info("[KoreaMed] ℹ️ No results found")
             else:
-                print(f"      ⚠️ Search failed (HTTP {response.status_code})")
+                logger.warning("[KoreaMed] ⚠️ Search failed (HTTP %s)", response.status_code)
             
             # 검색 상세 기록
             self.search_details.append({
@@ -733,51 +1071,133 @@ class DatabaseSearcher:
             })
                 
         except Exception as e:
-            print(f"      ❌ Error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[KoreaMed] ❌ Error: %s", e)
             self.errors.append({"database": "KoreaMed", "error": str(e)})
         
         return results
 
 
-def deduplicate_results(results: List[Dict]) -> List[Dict]:
+def iter_unique_results(results: Iterable[Dict]) -> Iterator[Dict]:
     """
-    중복 제거 - 제목 기준
+    중복 제거 - ID, 제목, 서지 시그니처 기준 (처음 나온 결과만 통과)
+    - 같은 ID (예: PubMed와 PMC의 PMID Fallback)
+    - 같은 제목 (대소문자/공백 무시)
+    - 같은 (구두점 무시 제목 앞 80자, 제1저자, 연도) → DB 간 교차 등재 논문 (저자/연도가 모두 있을 때만)
     """
+    seen_ids = set()
     seen_titles = set()
-    unique_results = []
+    seen_signatures = set()
     
     for result in results:
-        title_norm = result['title'].lower().strip()
-        if title_norm not in seen_titles and title_norm not in ["no title", ""]:
-            seen_titles.add(title_norm)
-            unique_results.append(result)
-    
-    return unique_results
+        # casefold: 유니코드(한글 포함) 대소문자 정규화, 공백 차이도 무시
+        title_norm = _WS_RE.sub(' ', result['title'].casefold()).strip()
+        if title_norm in _EMPTY_TITLES:
+            continue
+        
+        article_id = result.get('id')
+        first_author = result.get('authors', '').split(',')[0].strip().casefold()
+        year = str(result.get('year', '')).strip().casefold()
+        # 저자/연도가 미상(N/A, Unknown)이면 시그니처로 비교하지 않음 (제목 앞부분만 같은 다른 논문 보존)
+        signature = None
+        if first_author not in _PLACEHOLDER_VALUES and year not in _PLACEHOLDER_VALUES:
+            signature = (_NON_WORD_RE.sub(' ', title_norm).strip()[:80], first_author, year)
+        
+        if article_id in seen_ids or title_norm in seen_titles or signature in seen_signatures:
+            continue
+        
+        seen_ids.add(article_id)
+        seen_titles.add(title_norm)
+        if signature is not None:
+            seen_signatures.add(signature)
+        yield result
 
 
-def summarize_search_stats(results: List[Dict], query: str, databases: List[str]) -> Dict:
-    """검색 통계 요약"""
+def summarize_search_stats(
+    source_counts: Counter,
+    year_counts: Counter,
+    query: str,
+    databases: List[str]
+) -> Dict:
+    """검색 통계 요약 (출처/연도별 건수는 결과 순회 중 미리 집계된 Counter 사용)"""
+    # 연도 범위 - "Unknown", "N/A" 등 숫자가 아닌 연도는 제외
+    known_years = [int(year) for year in year_counts if year.isdigit()]
     stats = {
         "query": query,
-        "total_results": len(results),
+        "total_results": sum(source_counts.values()),
         "databases_searched": databases,
-        "results_by_source": defaultdict(int)
+        "results_by_source": dict(source_counts),
+        "results_by_year": dict(year_counts),
+        "year_range": [min(known_years), max(known_years)] if known_years else None
     }
     
-    for result in results:
-        stats["results_by_source"][result['source']] += 1
+    return stats
+
+
+def build_search_response(
+    result_lists: List[List[Dict]],
+    query: str,
+    databases: List[str],
+    return_format: str,
+    execution_summary: str,
+    errors: List[Dict]
+) -> Dict:
+    """
+    검색 결과 후처리 - 중복 제거, 통계 집계, 출력 렌더링을 결과 1회 순회로 처리
+    """
+    unique_results = []
+    source_counts = Counter()
+    year_counts = Counter()
+    parts = []
+    parts_append = parts.append
     
-    stats["results_by_source"] = dict(stats["results_by_source"])
+    for i, article in enumerate(iter_unique_results(chain.from_iterable(result_lists)), 1):
+        unique_results.append(article)
+        source_counts[article['source']] += 1
+        year_counts[str(article['year'])] += 1
+        if return_format == "compact":
+            parts_append(format_compact_row(article))
+        elif return_format == "detailed":
+            parts_append(_DETAIL_TMPL.format_map({**article, "i": i}))
     
-    return stats
+    stats = summarize_search_stats(source_counts, year_counts, query, databases)
+    
+    # 결과 포맷팅
+    if return_format == "compact":
+        results_table = COMPACT_HEADER + "".join(parts) if parts else "No results found."
+        return {
+            "success": True,
+            "format": "compact",
+            "query": query,
+            "content": execution_summary + "\n\n" + results_table,
+            "statistics": stats,
+            "errors": errors
+        }
+    elif return_format == "detailed":
+        # 상세 형식 (초록 전체 포함)
+        return {
+            "success": True,
+            "format": "detailed",
+            "query": query,
+            "content": execution_summary + "\n\n## Detailed Results\n\n" + "".join(parts),
+            "statistics": stats,
+            "errors": errors
+        }
+    else:  # json
+        return {
+            "success": True,
+            "format": "json",
+            "query": query,
+            "execution_summary": execution_summary,
+            "statistics": stats,
+            "results": unique_results,
+            "errors": errors
+        }
 
 
 # ==================== MCP Tools ====================
 
 @mcp.tool()
-def search_literature(
+async def search_literature(
     query: str,
     databases: Optional[List[str]] = None,
     max_results_per_db: int = 20,
@@ -816,100 +1236,64 @@ def search_literature(
         publication_types = []
     
     # 데이터베이스별 개수 설정
-    db_max_results = {}
-    if max_results_by_db:
-        for db in databases:
-            db_lower = db.lower()
-            db_max_results[db_lower] = max_results_by_db.get(db_lower, 
-                                        max_results_by_db.get(db.upper(), 
-                                        max_results_by_db.get(db, max_results_per_db)))
-    else:
-        for db in databases:
-            db_max_results[db.lower()] = max_results_per_db
+    # 키 대소문자 무관 ("PubMed", "PUBMED", "pubmed" 모두 허용) - 한 번 정규화 후 단일 조회
+    max_by_db = {name.lower(): value for name, value in (max_results_by_db or {}).items()}
+    db_max_results = {db.lower(): max_by_db.get(db.lower(), max_results_per_db) for db in databases}
     
-    print(f"\n{'='*70}")
-    print(f"🔍 Medical Literature Search v10")
-    print(f"{'='*70}")
-    print(f"Query: {query}")
-    print(f"Databases: {', '.join(databases)}")
-    print(f"⚠️ Using original query (no simplification)\n")
+    logger.debug("🔍 Medical Literature Search v10 - query: %s | databases: %s (original query, no simplification)", query, databases)
     
     searcher = DatabaseSearcher()
-    all_results = []
+    result_lists = []
     
-    # 각 데이터베이스 검색
+    # 각 데이터베이스 검색 (동시 실행: 전체 소요 시간 = 가장 느린 DB 기준)
+    loop = asyncio.get_running_loop()
+    searches = []
     for db in databases:
         db_lower = db.lower()
         db_max = db_max_results.get(db_lower, max_results_per_db)
         
-        try:
-            if db_lower == "pubmed":
-                results = searcher.search_pubmed(query, db_max, publication_types=publication_types)
-            elif db_lower == "pmc":
-                results = searcher.search_pmc(query, db_max)
-            elif db_lower == "koreamed":
-                results = searcher.search_koreamed(query, db_max)
-            else:
-                continue
-            
-            all_results.extend(results)
-            time.sleep(0.5)  # API 호출 제한 준수
-            
-        except Exception as e:
-            print(f"  ❌ Error in {db}: {e}")
-            searcher.errors.append({"database": db, "error": str(e)})
+        search_method = searcher.dispatch.get(db_lower)
+        if search_method is None:
+            continue
+        
+        if db_lower == "pubmed":
+            search = partial(search_method, query, db_max, publication_types=publication_types)
+        else:
+            search = partial(search_method, query, db_max)
+        
+        # 오류/로그에는 search_details, results_by_source와 같은 표시 이름 사용
+        searches.append((DB_LABELS.get(db_lower, db), loop.run_in_executor(_SEARCH_EXECUTOR, search)))
+    
+    # 전체 제한 시간 내에 끝난 DB 결과만 사용 (느린 DB 하나가 전체 응답을 붙잡지 않도록)
+    done = set()
+    if searches:  # asyncio.wait는 빈 목록을 허용하지 않음
+        done, _ = await asyncio.wait([task for _, task in searches], timeout=SEARCH_DEADLINE)
     
-    # 중복 제거
-    unique_results = deduplicate_results(all_results)
+    for label, task in searches:
+        if task not in done:
+            logger.error("[%s] ⏱ Timed out after %ss", label, SEARCH_DEADLINE)
+            searcher.errors.append({"database": label, "error": f"Timed out after {SEARCH_DEADLINE}s"})
+        elif task.exception() is not None:
+            logger.error("[%s] ❌ Error: %s", label, task.exception())
+            searcher.errors.append({"database": label, "error": str(task.exception())})
+        else:
+            result_lists.append(task.result())
     
-    # 통계
-    stats = summarize_search_stats(unique_results, query, databases)
+    # 시간 초과된 검색 스레드가 뒤늦게 기록해도 응답이 바뀌지 않도록 스냅샷 사용
+    # 완료 순서와 무관하게 요청한 DB 순서로 상세 정보 정렬
+    db_rank = {DB_LABELS[db.lower()]: i for i, db in enumerate(databases) if db.lower() in DB_LABELS}
+    search_details = sorted(searcher.search_details, key=lambda detail: db_rank.get(detail['database'], len(db_rank)))
+    errors = list(searcher.errors)
+    debug_info = {key: dict(value) for key, value in searcher.debug_info.items()}
+    if any(label == "PMC" and task not in done for label, task in searches):
+        # 시간 초과된 PMC의 ID 통계는 응답에 없는 논문까지 포함할 수 있으므로 제외
+        debug_info.pop("pmc_id_stats", None)
     
     # Search Execution Summary 생성 (디버깅 정보 포함)
-    execution_summary = generate_execution_summary(searcher.search_details, searcher.debug_info)
+    execution_summary = generate_execution_summary(search_details, debug_info)
     
-    # 결과 포맷팅
-    if return_format == "compact":
-        formatted_output = execution_summary + "\n\n" + format_results_compact(unique_results)
-        return {
-            "success": True,
-            "format": "compact",
-            "query": query,
-            "content": formatted_output,
-            "statistics": stats,
-            "errors": searcher.errors
-        }
-    elif return_format == "detailed":
-        # 상세 형식 (초록 전체 포함)
-        detailed_output = execution_summary + "\n\n## Detailed Results\n\n"
-        for i, article in enumerate(unique_results, 1):
-            detailed_output += f"### [{i}] {article['title']}\n\n"
-            detailed_output += f"**ID:** {article['id']}  \n"
-            detailed_output += f"**Source:** {article['source']}  \n"
-            detailed_output += f"**Journal:** {article['journal']} ({article['year']})  \n"
-            detailed_output += f"**Authors:** {article['authors']}  \n"
-            detailed_output += f"**URL:** {article['url']}  \n\n"
-            detailed_output += f"**Abstract:**  \n{article['abstract']}\n\n"
-            detailed_output += "---\n\n"
-        
-        return {
-            "success": True,
-            "format": "detailed",
-            "query": query,
-            "content": detailed_output,
-            "statistics": stats,
-            "errors": searcher.errors
-        }
-    else:  # json
-        return {
-            "success": True,
-            "format": "json",
-            "query": query,
-            "execution_summary": execution_summary,
-            "statistics": stats,
-            "results": unique_results,
-            "errors": searcher.errors
-        }
+    # 중복 제거 + 통계 + 포맷팅 (1회 순회)
+    return build_search_response(result_lists, query, databases, return_format, execution_summary, errors)
 
 
 @mcp.tool()
@@ -943,29 +1327,9 @@ def get_pubmed_query_guide() -> dict:
     }
 
 
-@mcp.tool()
-def get_query_examples(
-    database: str = "all"
-) -> dict:
-    """
-    Get practical search query examples for medical literature databases.
-    의학 문헌 데이터베이스 실용적인 검색 쿼리 예시 보기
-    
-    **Purpose / 목적:**
-    This function provides **ready-to-use query examples** for all databases (PubMed, PMC, KoreaMed).
-    For PubMed-specific advanced query guide with field tags, use `get_pubmed_query_guide()` instead.
-    
-    이 함수는 모든 데이터베이스(PubMed, PMC, KoreaMed)에서 **바로 사용 가능한 쿼리 예시**를 제공합니다.
-    필드 태그를 사용하는 PubMed 전용 고급 가이드는 `get_pubmed_query_guide()`를 사용하세요.
-    
-    Args:
-        database: "pubmed", "pmc", "koreamed", or "all" (default: all)
-    
-    Returns:
-        Ready-to-use query examples for each database with explanations
-        각 데이터베이스별 바로 사용 가능한 쿼리 예시 및 설명
-    """
-    
+@lru_cache(maxsize=8)
+def build_query_examples(database: str) -> str:
+    """get_query_examples 본문 생성 (인자에만 의존하므로 DB별로 1회만 생성)"""
     output = "# Medical Literature Search Query Examples\n"
     output += "# 의학 문헌 검색 쿼리 예시\n\n"
     
@@ -1069,9 +1433,35 @@ def get_query_examples(
     output += "3. **Start simple**: Begin with basic queries and add complexity as needed\n"
     output += "   **단순하게 시작**: 기본 쿼리로 시작하고 필요에 따라 복잡도 추가\n\n"
     
+    return output
+
+
+@mcp.tool()
+def get_query_examples(
+    database: str = "all"
+) -> dict:
+    """
+    Get practical search query examples for medical literature databases.
+    의학 문헌 데이터베이스 실용적인 검색 쿼리 예시 보기
+    
+    **Purpose / 목적:**
+    This function provides **ready-to-use query examples** for all databases (PubMed, PMC, KoreaMed).
+    For PubMed-specific advanced query guide with field tags, use `get_pubmed_query_guide()` instead.
+    
+    이 함수는 모든 데이터베이스(PubMed, PMC, KoreaMed)에서 **바로 사용 가능한 쿼리 예시**를 제공합니다.
+    필드 태그를 사용하는 PubMed 전용 고급 가이드는 `get_pubmed_query_guide()`를 사용하세요.
+    
+    Args:
+        database: "pubmed", "pmc", "koreamed", or "all" (default: all)
+    
+    Returns:
+        Ready-to-use query examples for each database with explanations
+        각 데이터베이스별 바로 사용 가능한 쿼리 예시 및 설명
+    """
+    
     return {
         "success": True,
-        "content": output
+        "content": build_query_examples(database.lower())
     }
 
 